@@ -0,0 +1,252 @@
+"""Measure bulk indexing throughput (documents/sec).
+
+Without ``--hosts`` the benchmark starts a local Elasticsearch stand-in that
+accepts the handful of APIs CertMonitor uses, so it measures the client side
+of the pipeline (serialization, HTTP) only. Point ``--hosts`` at a disposable
+cluster to compare the steady-state and catch-up settings; each mode writes to
+a fresh index, which is deleted with its template afterwards.
+"""
+import argparse
+import base64
+import datetime
+import json
+import logging
+import threading
+import time
+from dataclasses import replace
+from typing import Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import Encoding
+from cryptography.x509.oid import AuthorityInformationAccessOID, ExtendedKeyUsageOID, NameOID
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk
+from config import Config
+from ct_parser import parse_ct_entry
+from elastic import ensure_index_exists, IngestSettingsManager
+
+LOG_URL = "https://ct.example.com/log/"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal Elasticsearch stand-in: acknowledges everything, indexes nothing."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_HEAD(self):
+        # Index existence checks
+        self._reply(200, {})
+
+    def do_GET(self):
+        path = self.path.split("?")[0].strip("/")
+        if path.startswith("_alias/"):
+            alias = path.split("/", 1)[1]
+            self._reply(200, {f"{alias}-000001": {"aliases": {alias: {"is_write_index": True}}}})
+        else:
+            self._reply(200, {"version": {"number": "8.15.0"}, "tagline": "You Know, for Search"})
+
+    def do_PUT(self):
+        # Settings, templates and index creation; newer clients also PUT _bulk
+        body = self._body()
+        if not self.path.split("?")[0].endswith("_bulk"):
+            self._reply(200, {"acknowledged": True})
+            return
+        lines = [line for line in body.splitlines() if line.strip()]
+        items = []
+        for action_line in lines[::2]:
+            op, meta = next(iter(json.loads(action_line).items()))
+            items.append({op: {"_index": meta.get("_index"), "status": 201, "result": "created"}})
+        self._reply(200, {"took": 0, "errors": False, "items": items})
+
+    do_POST = do_PUT
+
+    def do_DELETE(self):
+        self._reply(200, {"acknowledged": True})
+
+
+def start_stand_in() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _tls(data: bytes) -> bytes:
+    """Prefix ``data`` with its 24-bit length, as in RFC 6962 structures."""
+    return len(data).to_bytes(3, "big") + data
+
+
+def make_ct_entry() -> dict:
+    """Build a get-entries X509LogEntry for a freshly issued leaf certificate."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Example Issuing CA")])
+    not_before = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    ca = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name)
+        .issuer_name(ca_name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(not_before)
+        .not_valid_after(not_before + datetime.timedelta(days=3650))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=0), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    leaf = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "host.example.com")]))
+        .issuer_name(ca_name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(not_before)
+        .not_valid_after(not_before + datetime.timedelta(days=90))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.DNSName("host.example.com"), x509.DNSName("www.host.example.com")]
+            ),
+            critical=False,
+        )
+        .add_extension(
+            x509.KeyUsage(True, False, False, False, False, False, False, False, False),
+            critical=True,
+        )
+        .add_extension(
+            x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH, ExtendedKeyUsageOID.CLIENT_AUTH]),
+            critical=False,
+        )
+        .add_extension(
+            x509.AuthorityInformationAccess([
+                x509.AccessDescription(
+                    AuthorityInformationAccessOID.OCSP,
+                    x509.UniformResourceIdentifier("http://ocsp.example.com"),
+                ),
+                x509.AccessDescription(
+                    AuthorityInformationAccessOID.CA_ISSUERS,
+                    x509.UniformResourceIdentifier("http://ca.example.com/issuer.der"),
+                ),
+            ]),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    # MerkleTreeLeaf: version, leaf type, timestamp, entry type, cert, extensions
+    timestamp = int(time.time() * 1000).to_bytes(8, "big")
+    leaf_input = b"\x00\x00" + timestamp + b"\x00\x00" + _tls(leaf.public_bytes(Encoding.DER)) + b"\x00\x00"
+    extra_data = _tls(_tls(ca.public_bytes(Encoding.DER)))
+    return {
+        "leaf_input": base64.b64encode(leaf_input).decode(),
+        "extra_data": base64.b64encode(extra_data).decode(),
+    }
+
+
+def make_template_doc() -> dict:
+    doc = parse_ct_entry(make_ct_entry(), LOG_URL, 0, {}, threading.Lock())
+    doc["source"]["name"] = "Example Log"
+    return doc
+
+
+def run(client: Elasticsearch, cfg, template: dict, docs: int, threads: int) -> Tuple[int, float]:
+    """Index ``docs`` copies of ``template`` from ``threads`` writers.
+
+    Returns the number of documents actually indexed and documents/sec.
+    """
+    per_thread = docs // threads
+
+    def writer(offset: int):
+        for start in range(offset, offset + per_thread, cfg.batch_size):
+            stop = min(start + cfg.batch_size, offset + per_thread)
+            actions = [{"_index": cfg.elastic_index, "_source": template} for _ in range(start, stop)]
+            bulk(client, actions, stats_only=True, chunk_size=cfg.batch_size)
+
+    workers = [threading.Thread(target=writer, args=(n * per_thread,)) for n in range(threads)]
+    began = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    indexed = per_thread * threads
+    return indexed, indexed / (time.perf_counter() - began)
+
+
+def delete_bench_index(client: Elasticsearch, base_index_name: str):
+    client.indices.delete(index=f"{base_index_name}-000001", ignore_unavailable=True)
+    # The template is missing if ensure_index_exists failed to create it
+    client.options(ignore_status=404).indices.delete_index_template(
+        name=f"{base_index_name}-template"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", help="Elasticsearch URL (default: local stand-in)")
+    parser.add_argument("--index", default="certmonitor_bench", help="Base index name prefix")
+    parser.add_argument("--docs", type=int, default=50000, help="Documents per run")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent bulk writers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    cfg = replace(Config(), elastic_index=args.index)
+    server = None
+    if args.hosts:
+        client = Elasticsearch(
+            hosts=[args.hosts],
+            basic_auth=(cfg.elastic_username, cfg.elastic_password),
+            request_timeout=cfg.request_timeout,
+        )
+    else:
+        server = start_stand_in()
+        client = Elasticsearch(hosts=[f"http://127.0.0.1:{server.server_port}"])
+
+    template = make_template_doc()
+    if not args.hosts:
+        # The stand-in ignores index settings, so both modes would match
+        try:
+            ensure_index_exists(client, cfg)
+            indexed, rate = run(client, cfg, template, args.docs, args.threads)
+            print(f"stand-in: {rate:,.0f} docs/sec ({indexed} docs, {args.threads} threads)")
+        finally:
+            server.shutdown()
+        return
+
+    # Switch immediately and include the replica change for the comparison
+    bench_cfg = replace(cfg, catchup_min_dwell=0, catchup_replicas_after=0, fetch_interval=0)
+    for mode, name, backlog in (
+        ("steady-state", "steady", 0),
+        ("catch-up", "catchup", cfg.catchup_threshold),
+    ):
+        # A fresh index per mode, so neither run writes into the other's documents
+        mode_cfg = replace(bench_cfg, elastic_index=f"{args.index}_{name}")
+        try:
+            ensure_index_exists(client, mode_cfg)
+            IngestSettingsManager(client, mode_cfg).report_backlog("bench", backlog)
+            # Let replica changes settle before measuring
+            client.options(ignore_status=408).cluster.health(
+                index=f"{mode_cfg.elastic_index}-000001",
+                wait_for_no_relocating_shards=True,
+                wait_for_status="yellow",
+                timeout="120s",
+            )
+            indexed, rate = run(client, mode_cfg, template, args.docs, args.threads)
+            print(f"{mode:>12}: {rate:,.0f} docs/sec ({indexed} docs, {args.threads} threads)")
+        finally:
+            delete_bench_index(client, mode_cfg.elastic_index)
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,40 @@ import os
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
+# "bulk" switches index settings between catch-up and tailing and picks
+# write-optimized template defaults; "default" keeps the template static.
+_ingest_profile = os.getenv("INGEST_PROFILE", "default").lower()
+_bulk = _ingest_profile == "bulk"
+
 @dataclass
 class Config:
     elasticsearch_hosts: str = os.getenv("ELASTICSEARCH_HOSTS", "http://localhost:9200")
     elastic_username: str = os.getenv("ELASTICSEARCH_USERNAME", "elastic")
     elastic_password: str = os.getenv("ELASTICSEARCH_PASSWORD", "changeme")
     elastic_index: str = os.getenv("ELASTICSEARCH_INDEX", "ssl_certificates")
+    ingest_profile: str = _ingest_profile
+    refresh_interval: str = os.getenv("REFRESH_INTERVAL", "1s")
+    number_of_replicas: int = int(os.getenv("NUMBER_OF_REPLICAS", "1"))
+    catchup_threshold: int = int(os.getenv("CATCHUP_THRESHOLD", "10000"))
+    catchup_min_dwell: int = int(os.getenv("CATCHUP_MIN_DWELL", "600"))
+    catchup_replicas_after: int = int(os.getenv("CATCHUP_REPLICAS_AFTER", "1800"))
+    catchup_refresh_interval: str = os.getenv("CATCHUP_REFRESH_INTERVAL", "30s")
+    catchup_replicas: int = int(os.getenv("CATCHUP_REPLICAS", "0"))
+    catchup_translog_durability: str = os.getenv("CATCHUP_TRANSLOG_DURABILITY", "async")
+    index_codec: str = os.getenv("INDEX_CODEC", "best_compression" if _bulk else "default")
+    source_mode: str = os.getenv("SOURCE_MODE", "stored")
+    source_excludes: str = os.getenv("SOURCE_EXCLUDES", "")
+    unindexed_fields: str = os.getenv(
+        "UNINDEXED_FIELDS",
+        "cert_link,ocsp_url,issuer_cert_url,crl_url" if _bulk else "",
+    )
     fetch_interval: int = int(os.getenv("FETCH_INTERVAL", "60"))
     batch_size: int = int(os.getenv("BATCH_SIZE", "256"))
     cache_maxsize: int = int(os.getenv("CACHE_MAXSIZE", "100000"))
     cache_ttl: int = int(os.getenv("CACHE_TTL", "3600"))
+    correlate_issuances: bool = os.getenv("CORRELATE_ISSUANCES", "true").lower() in ("1", "true", "yes")
+    issuance_cache_maxsize: int = int(os.getenv("ISSUANCE_CACHE_MAXSIZE", "100000"))
+    issuance_cache_ttl: int = int(os.getenv("ISSUANCE_CACHE_TTL", "3600"))
     request_timeout: int = int(os.getenv("REQUEST_TIMEOUT", "10"))
     logging_level: str = os.getenv("LOGGING_LEVEL", "INFO")
     certificate_subject_match: str = os.getenv("CERTIFICATE_SUBJECT_MATCH", "")
@@ -1,5 +1,6 @@
 import base64
 import hashlib
+import logging
 import time
 from datetime import datetime, timezone
 from typing import Optional
@@ -78,7 +79,27 @@ def get_issuer_name(cert: x509.Certificate) -> str:
     return name
 
 
-def parse_ct_entry(entry: dict, log_url: str, index: int, seen_certs: dict, seen_lock) -> Optional[dict]:
+def get_issuance_key(cert: x509.Certificate) -> str:
+    """Return a key shared by a precertificate and its final certificate.
+
+    The two carry different fingerprints (poison extension vs. embedded SCTs)
+    but normally the same issuer name and serial number. A precertificate
+    signed by a Precertificate Signing Certificate (RFC 6962 section 3.1) has a
+    different issuer, so such pairs are not correlated.
+    """
+    issuer = cert.issuer.public_bytes()
+    serial = str(cert.serial_number).encode()
+    return hashlib.sha256(issuer + b"\x00" + serial).hexdigest().upper()
+
+
+def parse_ct_entry(
+    entry: dict,
+    log_url: str,
+    index: int,
+    seen_certs: dict,
+    seen_lock,
+    seen_issuances: Optional[dict] = None,
+) -> Optional[dict]:
     leaf_b64 = entry.get("leaf_input")
     extra_b64 = entry.get("extra_data")
     if not leaf_b64 or not extra_b64:
@@ -150,10 +171,16 @@ def parse_ct_entry(entry: dict, log_url: str, index: int, seen_certs: dict, seen
         return None
 
     fingerprint = hashlib.sha256(leaf_cert_bytes).hexdigest().upper()
+    issuance_key = get_issuance_key(cert) if seen_issuances is not None else None
     with seen_lock:
         if fingerprint in seen_certs:
             return None
         seen_certs[fingerprint] = True
+        # Only the first of a precert/final pair seen is parsed further
+        if issuance_key is not None:
+            if issuance_key in seen_issuances:
+                return None
+            seen_issuances[issuance_key] = True
 
     not_before = cert.not_valid_before_utc.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
     not_after = cert.not_valid_after_utc.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
@@ -1,5 +1,8 @@
+import time
+from threading import Lock
+from typing import Dict, Optional, Set
 from elasticsearch import Elasticsearch
-from elastic_transport import ApiError
+from elastic_transport import ApiError, TransportError
 import logging
 
 def get_client(cfg):
@@ -14,7 +17,24 @@ def get_client(cfg):
         logging.error(f"Failed to create Elasticsearch client: {e}")
         raise
 
-def ensure_index_exists(client: Elasticsearch, base_index_name: str):
+def _split_csv(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _disable_field_indexing(properties: dict, fields: list):
+    """Keep the listed (dotted) fields in _source and doc values but out of the inverted index."""
+    for field in fields:
+        mapping = {"properties": properties}
+        for part in field.split("."):
+            mapping = mapping.get("properties", {}).get(part)
+            if mapping is None:
+                break
+        if mapping is None or "type" not in mapping:
+            logging.warning(f"Cannot disable indexing for unknown field '{field}'")
+            continue
+        mapping["index"] = False
+
+def ensure_index_exists(client: Elasticsearch, cfg):
+    base_index_name = cfg.elastic_index
     index_name = f"{base_index_name}-000001"
     alias_name = base_index_name
     template_name = f"{base_index_name}-template"
@@ -26,8 +46,9 @@ def ensure_index_exists(client: Elasticsearch, base_index_name: str):
             "settings": {
                 "index.lifecycle.name": policy_name,  # assumes policy already exists
                 "index.lifecycle.rollover_alias": alias_name,
-                "number_of_replicas": 1,
-                "refresh_interval": "1s",
+                "number_of_replicas": cfg.number_of_replicas,
+                "refresh_interval": cfg.refresh_interval,
+                "index.codec": cfg.index_codec,
                 "routing.allocation.include._tier_preference": "data_content"
             },
             "mappings": {
@@ -90,6 +111,15 @@ def ensure_index_exists(client: Elasticsearch, base_index_name: str):
         "priority": 501
     }
 
+    settings = template_body["template"]["settings"]
+    mappings = template_body["template"]["mappings"]
+    if cfg.source_mode == "synthetic":
+        # Rebuilds _source from doc values instead of storing it
+        settings["index.mapping.source.mode"] = "synthetic"
+    elif _split_csv(cfg.source_excludes):
+        mappings["_source"] = {"excludes": _split_csv(cfg.source_excludes)}
+    _disable_field_indexing(mappings["properties"], _split_csv(cfg.unindexed_fields))
+
     try:
         client.indices.put_index_template(name=template_name, body=template_body)
         logging.info("Ensured index template is current.")
@@ -113,3 +143,139 @@ def ensure_index_exists(client: Elasticsearch, base_index_name: str):
             logging.info(f"Index '{index_name}' already exists.")
     except ApiError as e:
         logging.error(f"Error ensuring index exists: {e}")
+
+
+class IngestSettingsManager:
+    """Switch the write index between catch-up and steady-state tailing settings.
+
+    Monitor threads report how far behind their log they are. While any log is
+    at least ``catchup_threshold`` entries behind, refresh is slowed and the
+    translog is fsynced asynchronously; once every log is within one batch of
+    its tree head the steady-state settings are restored. Each mode is held for
+    at least ``catchup_min_dwell`` seconds. Replicas are only dropped once a log
+    has not reached its head for ``catchup_replicas_after`` seconds, since
+    adding them back copies the whole shard. Every index put into catch-up is
+    tracked, so an index rolled over mid catch-up is restored too and its
+    successor is switched in its place.
+    """
+
+    def __init__(self, client: Elasticsearch, cfg):
+        self.client = client
+        self.cfg = cfg
+        self._lock = Lock()
+        self._apply_lock = Lock()
+        self._backlogs: Dict[str, int] = {}
+        self._caught_up_at: Dict[str, float] = {}
+        self._catching_up: Optional[bool] = None
+        self._replicas_dropped = False
+        self._mode_since = 0.0
+        self._catchup_indices: Set[str] = set()
+        self._applied_index: Optional[str] = None
+        self._checked_at = float("-inf")
+        self._failed_at = float("-inf")
+
+    def catchup_settings(self, drop_replicas: bool = True) -> dict:
+        replicas = self.cfg.catchup_replicas if drop_replicas else self.cfg.number_of_replicas
+        return {
+            "index.refresh_interval": self.cfg.catchup_refresh_interval,
+            "index.number_of_replicas": replicas,
+            "index.translog.durability": self.cfg.catchup_translog_durability,
+        }
+
+    def steady_settings(self) -> dict:
+        return {
+            "index.refresh_interval": self.cfg.refresh_interval,
+            "index.number_of_replicas": self.cfg.number_of_replicas,
+            "index.translog.durability": "request",
+        }
+
+    def report_backlog(self, log_url: str, backlog: int):
+        now = time.monotonic()
+        with self._lock:
+            self._backlogs[log_url] = max(backlog, 0)
+            if backlog < self.cfg.batch_size or log_url not in self._caught_up_at:
+                self._caught_up_at[log_url] = now
+            behind = any(b >= self.cfg.catchup_threshold for b in self._backlogs.values())
+            caught_up = all(b < self.cfg.batch_size for b in self._backlogs.values())
+            dwelled = now - self._mode_since >= self.cfg.catchup_min_dwell
+            catching_up = bool(self._catching_up)
+            if self._catching_up is None:
+                catching_up = behind
+            elif dwelled and behind and not self._catching_up:
+                catching_up = True
+            elif dwelled and caught_up and self._catching_up:
+                catching_up = False
+            drop_replicas = catching_up and any(
+                now - t >= self.cfg.catchup_replicas_after for t in self._caught_up_at.values()
+            )
+            changed = (catching_up, drop_replicas) != (self._catching_up, self._replicas_dropped)
+            # While catching up, re-check the write index for rollovers
+            recheck = catching_up and now - self._checked_at >= self.cfg.fetch_interval
+            # After a failure, wait fetch_interval before trying again
+            backing_off = now - self._failed_at < self.cfg.fetch_interval
+            if backing_off or not (changed or recheck):
+                return
+            self._checked_at = now
+        # Elasticsearch calls run outside _lock so monitor threads never wait on
+        # them; if another thread is already applying, leave it to that thread
+        if self._apply_lock.acquire(blocking=False):
+            try:
+                self._apply(catching_up, drop_replicas)
+            finally:
+                self._apply_lock.release()
+
+    def restore(self):
+        """Return every index left in catch-up to steady-state settings, e.g. on shutdown."""
+        with self._apply_lock:
+            with self._lock:
+                if self._catching_up is False and not self._catchup_indices:
+                    return
+            self._apply(False)
+
+    def _write_index(self) -> str:
+        alias = self.cfg.elastic_index
+        aliases = self.client.indices.get_alias(name=alias)
+        for index, body in aliases.items():
+            if body.get("aliases", {}).get(alias, {}).get("is_write_index"):
+                return index
+        return alias
+
+    def _put_settings(self, index: str, settings: dict, mode: str):
+        self.client.indices.put_settings(index=index, settings=settings)
+        logging.info(f"Switched {index} to {mode} ingest settings: {settings}")
+
+    def _apply(self, catching_up: bool, drop_replicas: bool = False):
+        """Push settings to Elasticsearch; callers hold ``_apply_lock``, not ``_lock``."""
+        with self._lock:
+            changed = (catching_up, drop_replicas) != (self._catching_up, self._replicas_dropped)
+            applied_index = self._applied_index
+            catchup_indices = set(self._catchup_indices)
+        restored = set()
+        try:
+            index = self._write_index()
+            # Indices rolled over during catch-up no longer take writes
+            for old_index in sorted(catchup_indices - {index}):
+                self._put_settings(old_index, self.steady_settings(), "steady-state")
+                restored.add(old_index)
+            if changed or index != applied_index:
+                if catching_up:
+                    self._put_settings(index, self.catchup_settings(drop_replicas), "catch-up")
+                else:
+                    self._put_settings(index, self.steady_settings(), "steady-state")
+        except (ApiError, TransportError) as e:
+            logging.error(f"Error applying ingest settings: {e}")
+            with self._lock:
+                self._catchup_indices -= restored
+                self._failed_at = time.monotonic()
+            return
+        with self._lock:
+            self._catchup_indices -= restored
+            if catching_up:
+                self._catchup_indices.add(index)
+            else:
+                self._catchup_indices.discard(index)
+            if catching_up != self._catching_up:
+                self._mode_since = time.monotonic()
+            self._catching_up = catching_up
+            self._replicas_dropped = drop_replicas
+            self._applied_index = index
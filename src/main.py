@@ -1,7 +1,7 @@
 import logging
 import signal
 from config import Config
-from elastic import get_client, ensure_index_exists
+from elastic import get_client, ensure_index_exists, IngestSettingsManager
 from monitor import start_monitoring
 
 def main():
@@ -14,9 +14,13 @@ def main():
     if not client.ping():
         logging.error("Cannot reach Elasticsearch")
         return
-    ensure_index_exists(client, cfg.elastic_index)
+    ensure_index_exists(client, cfg)
 
-    stop_event, threads = start_monitoring(cfg, client)
+    ingest_settings = None
+    if cfg.ingest_profile == "bulk":
+        ingest_settings = IngestSettingsManager(client, cfg)
+
+    stop_event, threads = start_monitoring(cfg, client, ingest_settings)
     
     def _shutdown(sig, frame):
         logging.info("Shutdown signal received")
@@ -28,6 +32,9 @@ def main():
     for t in threads:
         t.join()
 
+    if ingest_settings:
+        ingest_settings.restore()
+
 
 if __name__ == '__main__':
     main()
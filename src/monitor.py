@@ -9,6 +9,7 @@ from cachetools import TTLCache
 from elasticsearch.helpers import BulkIndexError, bulk
 from ct_parser import parse_ct_entry
 from ct_utils import make_request, load_log_list
+from elastic import IngestSettingsManager
 
 # Thread-safe lock for shared cert cache
 seen_lock = Lock()
@@ -33,7 +34,15 @@ def matches_subject_filter(cert_meta: dict, cfg) -> bool:
         return False
     return not any(term in subject for term in excluded_terms)
 
-def monitor_log(log_info: dict, cfg, client, seen_cache: TTLCache, stop_event: Event) -> None:
+def monitor_log(
+    log_info: dict,
+    cfg,
+    client,
+    seen_cache: TTLCache,
+    stop_event: Event,
+    issuance_cache: Optional[TTLCache] = None,
+    ingest_settings: Optional[IngestSettingsManager] = None,
+) -> None:
     """Monitor a single CT log for new certificates."""
     session = requests.Session()
 
@@ -79,6 +88,9 @@ def monitor_log(log_info: dict, cfg, client, seen_cache: TTLCache, stop_event: E
                 logging.warning(f"{desc}: tree size decreased from {next_index} to {current_size}, resetting index.")
                 next_index = current_size
 
+            if ingest_settings:
+                ingest_settings.report_backlog(url, current_size - next_index)
+
             # Process new entries
             if current_size > next_index:
                 start = next_index
@@ -109,7 +121,9 @@ def monitor_log(log_info: dict, cfg, client, seen_cache: TTLCache, stop_event: E
                     docs = []
                     for idx, entry in enumerate(entries, start=start):
                         try:
-                            cert_meta = parse_ct_entry(entry, url, idx, seen_cache, seen_lock)
+                            cert_meta = parse_ct_entry(
+                                entry, url, idx, seen_cache, seen_lock, issuance_cache
+                            )
                             if cert_meta and matches_subject_filter(cert_meta, cfg):
                                 cert_meta["source"]["name"] = desc
                                 docs.append(cert_meta)
@@ -147,6 +161,8 @@ def monitor_log(log_info: dict, cfg, client, seen_cache: TTLCache, stop_event: E
                     start = end + 1
                     end = min(current_size - 1, start + cfg.batch_size - 1)
                     next_index = start
+                    if ingest_settings:
+                        ingest_settings.report_backlog(url, current_size - next_index)
 
             # Wait before next check
             time.sleep(cfg.fetch_interval)
@@ -160,7 +176,9 @@ def monitor_log(log_info: dict, cfg, client, seen_cache: TTLCache, stop_event: E
                 session.close()
 
 
-def start_monitoring(cfg, client) -> Optional[Tuple[Event, List[Thread]]]:
+def start_monitoring(
+    cfg, client, ingest_settings: Optional[IngestSettingsManager] = None
+) -> Optional[Tuple[Event, List[Thread]]]:
     """Start monitoring all configured CT logs."""
     logs = load_log_list(cfg.ct_log_list_url, cfg.request_timeout)
     if not logs:
@@ -174,6 +192,13 @@ def start_monitoring(cfg, client) -> Optional[Tuple[Event, List[Thread]]]:
         )
     
     seen_cache = TTLCache(maxsize=cfg.cache_maxsize, ttl=cfg.cache_ttl)
+    # Precertificates and their final certificates share issuer and serial,
+    # so only the first of each pair seen across all logs is indexed.
+    issuance_cache = None
+    if cfg.correlate_issuances:
+        issuance_cache = TTLCache(
+            maxsize=cfg.issuance_cache_maxsize, ttl=cfg.issuance_cache_ttl
+        )
     stop_event = threading.Event()
     threads = []
 
@@ -181,7 +206,15 @@ def start_monitoring(cfg, client) -> Optional[Tuple[Event, List[Thread]]]:
         try:
             t = Thread(
                 target=monitor_log,
-                args=(log, cfg, client, seen_cache, stop_event),
+                args=(
+                    log,
+                    cfg,
+                    client,
+                    seen_cache,
+                    stop_event,
+                    issuance_cache,
+                    ingest_settings,
+                ),
                 daemon=True,
                 name=f"CTMonitor-{log.get('description', 'Unknown')}"
             )